@@ -7,10 +7,47 @@ This program will analyze and chart out information from a dataset using streaml
 """
 
 # Import all tools
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import pydeck as pdk
+import altair as alt
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+# Data Files
+
+DATA_CSV = "nuclear_explosions.csv"
+DATA_PARQUET = "nuclear_explosions.parquet"
+
+# Raw columns the app reads, with Arrow types for the streamed Parquet conversion
+# (categories become dictionaries)
+SIDECAR_TYPES = {
+    'WEAPON SOURCE COUNTRY': pa.dictionary(pa.int32(), pa.string()),
+    'Data.Purpose': pa.dictionary(pa.int32(), pa.string()),
+    'Data.Type': pa.dictionary(pa.int32(), pa.string()),
+    'Location.Cordinates.Latitude': pa.float64(),
+    'Location.Cordinates.Longitude': pa.float64(),
+    'Data.Yeild.Lower': pa.float64(),
+    'Date.Year': pa.int64(),
+    'Date.Month': pa.int64(),
+    'Date.Day': pa.int64()
+}
+
+RAW_COLUMNS = list(SIDECAR_TYPES)
+
+RAW_DTYPES = {
+    'WEAPON SOURCE COUNTRY': 'category',
+    'Data.Purpose': 'category',
+    'Data.Type': 'category'
+}
+
+# Bytes of CSV parsed per batch when building the Parquet sidecar
+CSV_BLOCK_SIZE = 1 << 20
 
 
 # Data Dictionaries
@@ -54,8 +91,61 @@ TYPE_DICT = {
 
 # Data Processing
 
+def read_raw_csv():
+    # Skip unused columns in the parser and store the label codes as categories
+    return pd.read_csv(DATA_CSV, engine="pyarrow", usecols=RAW_COLUMNS, dtype=RAW_DTYPES)
+
+
+def write_parquet_sidecar():
+    # Stream the CSV into Parquet one batch at a time so peak memory stays at one block
+    reader = pa_csv.open_csv(
+        DATA_CSV,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=RAW_COLUMNS,
+            column_types=SIDECAR_TYPES
+        )
+    )
+    # Write beside the target and swap in at the end so a failed run never leaves half a file
+    partial_path = DATA_PARQUET + ".partial"
+    try:
+        with pq.ParquetWriter(partial_path, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+        os.replace(partial_path, DATA_PARQUET)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def read_raw_data():
+    # Parse the CSV once into a typed Parquet sidecar, then load only the columns we use
+    try:
+        if (not os.path.exists(DATA_PARQUET)
+                or os.path.getmtime(DATA_PARQUET) < os.path.getmtime(DATA_CSV)):
+            write_parquet_sidecar()
+    except (OSError, pa.ArrowException):
+        # Read-only deployment or failed conversion: fall back to the CSV
+        return read_raw_csv()
+    return pd.read_parquet(DATA_PARQUET, engine="pyarrow", columns=RAW_COLUMNS)
+
+
+def relabel(codes, mapping):
+    # Translate the small category table, then remap every row's code in one take.
+    # Unknown codes become 'Other'; missing values (code -1) hit the trailing 'Other'.
+    codes = codes.astype('category')
+    labels = pd.Index([mapping.get(code, 'Other') for code in codes.cat.categories] + ['Other'])
+    categories = labels.unique()
+    lookup = categories.get_indexer(labels)
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[codes.cat.codes.values], categories),
+        index=codes.index
+    ).cat.remove_unused_categories()
+
+
+@st.cache_data(show_spinner=False)
 def load_and_clean_data():
-    df = pd.read_csv("nuclear_explosions.csv")
+    df = read_raw_data()
 
     # Column renaming
     df = df.rename(columns={
@@ -78,12 +168,116 @@ def load_and_clean_data():
     df['Year'] = df['Date'].dt.year
     df['Decade'] = (df['Year'] // 10) * 10
 
-    # Data enrichment
-    df['Country'] = df['Country'].map(COUNTRIES).fillna('Other')
-    df['Purpose_Label'] = df['Purpose'].map(PURPOSE_DICT).fillna('Other')
-    df['Type_Label'] = df['Type'].map(TYPE_DICT).fillna('Other')
+    # Data enrichment (categorical labels so isin/value_counts run on integer codes)
+    df['Country'] = relabel(df['Country'], COUNTRIES)
+    df['Purpose_Label'] = relabel(df['Purpose'], PURPOSE_DICT)
+    df['Type_Label'] = relabel(df['Type'], TYPE_DICT)
+
+    # Sidebar options, sorted once here so reruns reuse the cached lists
+    countries = sorted(df['Country'].unique())
+    purposes = sorted(df['Purpose_Label'].unique())
+    types = sorted(df['Type_Label'].unique())
+
+    # Country totals use the full dataset only, so count them once here as well
+    country_counts = df['Country'].value_counts().sort_values(ascending=False)
+
+    return df, countries, purposes, types, country_counts
+
+
+def filter_dataset(df, countries, purposes, types, dates):
+    # Reduce raw numpy masks into one buffer so the frame is only indexed once
+    masks = [
+        df['Country'].isin(countries).values,
+        df['Purpose_Label'].isin(purposes).values,
+        df['Type_Label'].isin(types).values
+    ]
+    if len(dates) == 2:
+        date_values = df['Date'].values
+        masks.append(date_values >= np.datetime64(dates[0]))
+        masks.append(date_values <= np.datetime64(dates[1]))
+    return df.iloc[np.logical_and.reduce(masks)]
+
+
+def summarize(filtered_df):
+    # Per-selection aggregates behind the timeline and breakdown charts
+    time_series = filtered_df.groupby('Year').size().rename('Detonations')
+    if not time_series.empty:
+        # Keep years without detonations on the timeline as zeros
+        time_series = time_series.reindex(
+            range(time_series.index.min(), time_series.index.max() + 1), fill_value=0
+        )
+    # Dates on the index so the chart axis reads as years, not 1,950
+    time_series.index = pd.to_datetime(time_series.index.astype(str), format='%Y')
+
+    purpose_counts = filtered_df['Purpose_Label'].value_counts()
+    purpose_counts = purpose_counts[purpose_counts > 0]
+    type_counts = filtered_df['Type_Label'].value_counts()
+    type_counts = type_counts[type_counts > 0]
+    return time_series, purpose_counts, type_counts
+
+
+# Bounded so a long-running server keeps only recent selections
+FILTER_CACHE_ENTRIES = 32
+
+
+@st.cache_data(show_spinner=False, max_entries=FILTER_CACHE_ENTRIES)
+def filtered_view(df, countries, purposes, types, dates):
+    # df is hashed with the selections, so reloaded data never reuses a stale view.
+    # Only the coordinates go to the map since it shows nothing else.
+    filtered_df = filter_dataset(df, countries, purposes, types, dates)
+    map_df = filtered_df[['Longitude', 'Latitude']]
+    return (filtered_df, map_df, *summarize(filtered_df))
 
-    return df
+
+# Charts
+
+def country_bar_chart(country_counts):
+    # Bars with their totals written on top, in descending data order
+    data = country_counts.rename_axis('Country').reset_index(name='Detonations')
+    data['Country'] = data['Country'].astype(str)
+    base = alt.Chart(data).encode(
+        x=alt.X('Country', sort=None, title="Country", axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y('Detonations', title="Number of Detonations")
+    )
+    bars = base.mark_bar(color='#ff7f7f', stroke='#ff4b4b')
+    labels = base.mark_text(baseline='bottom', dy=-2, fontSize=9).encode(text='Detonations')
+    return (bars + labels).properties(title="Nuclear Tests by Country")
+
+
+def timeline_chart(time_series):
+    # Dashed line with a marker on every year
+    data = time_series.rename_axis('Year').reset_index()
+    return alt.Chart(data).mark_line(
+        color='#ff4b4b', point=True, strokeDash=[4, 2]
+    ).encode(
+        x=alt.X('Year', type='temporal', title="Year"),
+        y=alt.Y('Detonations', title="Detonations"),
+        tooltip=[alt.Tooltip('Year', type='temporal', format='%Y'), 'Detonations']
+    )
+
+
+# Filtered Charts
+
+def build_map(map_df):
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=map_df,
+        get_position=['Longitude', 'Latitude'],
+        get_radius=50000,
+        get_fill_color=[255, 75, 75, 180],
+        pickable=True
+    )
+    #USED STACK OVERFLOW ARTICLE ABOUT MAKING CHARTS FOR FORMATTING HELP AND WAYS TO MAKE CHARTS LOOK BETTTER
+    return pdk.Deck(
+        map_style='mapbox://styles/mapbox/dark-v10',
+        initial_view_state=pdk.ViewState(
+            latitude=30,
+            longitude=0,
+            zoom=1,
+            pitch=40
+        ),
+        layers=[layer]
+    )
 
 
 # Main function
@@ -96,7 +290,7 @@ def main():
     )
 
     st.title("Nuclear Detonation Analysis (1945-1998)")
-    df = load_and_clean_data()
+    df, all_countries, purpose_options, type_options, country_counts = load_and_clean_data()
 
     with st.sidebar:
         st.header("Control Panel")
@@ -113,8 +307,6 @@ def main():
 
         # Country Selection
         st.subheader("Country Selection")
-        all_countries = sorted(df['Country'].unique())
-
         # Select All functionality
         if st.button('Select All Countries'):
             st.session_state.selected_countries = all_countries
@@ -128,7 +320,6 @@ def main():
 
         # Purpose Selection
         st.subheader("Detonation Purpose")
-        purpose_options = sorted(df['Purpose_Label'].unique())
         selected_purposes = st.multiselect(
             "Select Purposes",
             options=purpose_options,
@@ -137,7 +328,6 @@ def main():
 
         # Type Selection
         st.subheader("Detonation Type")
-        type_options = sorted(df['Type_Label'].unique())
         selected_types = st.multiselect(
             "Select Types",
             options=type_options,
@@ -147,17 +337,9 @@ def main():
     # -------------------
     # DATA FILTERING
     # -------------------
-    filtered_df = df[
-        (df['Country'].isin(selected_countries)) &
-        (df['Purpose_Label'].isin(selected_purposes)) &
-        (df['Type_Label'].isin(selected_types))
-        ]
-
-    if len(selected_dates) == 2:
-        filtered_df = filtered_df[
-            (filtered_df['Date'] >= pd.to_datetime(selected_dates[0])) &
-            (filtered_df['Date'] <= pd.to_datetime(selected_dates[1]))
-            ]
+    filtered_df, map_df, time_series, purpose_counts, type_counts = filtered_view(
+        df, selected_countries, selected_purposes, selected_types, tuple(selected_dates)
+    )
 
 
     # Visualizations
@@ -167,40 +349,11 @@ def main():
     with col1:
         # Global Map
         st.subheader("Global Detonation Map")
-        layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=filtered_df,
-            get_position=['Longitude', 'Latitude'],
-            get_radius=50000,
-            get_fill_color=[255, 75, 75, 180],
-            pickable=True
-        )
-        #USED STACK OVERFLOW ARTICLE ABOUT MAKING CHARTS FOR FORMATTING HELP AND WAYS TO MAKE CHARTS LOOK BETTTER
-        st.pydeck_chart(pdk.Deck(
-            map_style='mapbox://styles/mapbox/dark-v10',
-            initial_view_state=pdk.ViewState(
-                latitude=30,
-                longitude=0,
-                zoom=1,
-                pitch=40
-            ),
-            layers=[layer]
-        ))
+        st.pydeck_chart(build_map(map_df))
 
         # Static Country Totals
         st.subheader("Total Detonations by Country (1945-1998)")
-        country_counts = df['Country'].value_counts().sort_values(ascending=False)
-        fig, ax = plt.subplots(figsize=(10, 4))
-        country_counts.plot(kind='bar', color='#ff7f7f', edgecolor='#ff4b4b', ax=ax)
-        ax.set_title("Nuclear Tests by Country", fontsize=16)
-        ax.set_xlabel("Country", fontsize=12)
-        ax.set_ylabel("Number of Detonations", fontsize=12)
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(axis='y', alpha=0.3)
-        for i in range(len(country_counts)):
-            v = country_counts[i]
-            ax.text(i, v + 2, str(v), ha='center', va='bottom', fontsize=9)
-        st.pyplot(fig)
+        st.altair_chart(country_bar_chart(country_counts))
 
     with col2:
         # Statistics
@@ -211,14 +364,7 @@ def main():
 
         # Temporal Analysis
         st.subheader("Detonations Timeline")
-        time_series = filtered_df.resample('Y', on='Date').size()
-        fig2, ax2 = plt.subplots(figsize=(10, 4))
-        ax2.plot(time_series.index.year, time_series.values,
-                 color='#ff4b4b', marker='o', linestyle='--')
-        ax2.set_xlabel("Year", fontsize=10)
-        ax2.set_ylabel("Detonations", fontsize=10)
-        ax2.grid(True, alpha=0.3)
-        st.pyplot(fig2)
+        st.altair_chart(timeline_chart(time_series))
 
     # Additional Charts
     st.subheader("Detailed Breakdown")
@@ -227,19 +373,21 @@ def main():
     with col3:
         # Purpose Distribution
         st.write("### Purpose Distribution")
-        purpose_counts = filtered_df['Purpose_Label'].value_counts()
         fig3, ax3 = plt.subplots()
         purpose_counts.plot(kind='pie', autopct='%1.1f%%', ax=ax3)
         st.pyplot(fig3)
+        plt.close(fig3)
 
     with col4:
         # Type Distribution
         st.write("### Detonation Types")
-        type_counts = filtered_df['Type_Label'].value_counts()
-        fig4, ax4 = plt.subplots()
-        type_counts.plot(kind='barh', color='#ff4b4b', ax=ax4)
-        ax4.set_xlabel("Number of Detonations")
-        st.pyplot(fig4)
+        st.bar_chart(
+            type_counts,
+            y_label="Number of Detonations",
+            color='#ff4b4b',
+            horizontal=True,
+            sort=False
+        )
 
 
 if __name__ == "__main__":